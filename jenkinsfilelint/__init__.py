@@ -2,8 +2,18 @@
 
 from importlib.metadata import version, PackageNotFoundError
 
-try:
-    __version__ = version("jenkinsfilelint")
-except PackageNotFoundError:
-    # Package is not installed
-    __version__ = "0.0.0.dev0"
+
+def _read_version() -> str:
+    """Read the installed package version.
+
+    Returns:
+        The package version, or a dev version if the package is not installed
+    """
+    try:
+        return version("jenkinsfilelint")
+    except PackageNotFoundError:
+        # Package is not installed
+        return "0.0.0.dev0"
+
+
+__version__ = _read_version()
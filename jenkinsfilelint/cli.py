@@ -3,12 +3,137 @@
 
 import sys
 import argparse
+import fnmatch
+import functools
 import io
-from pathlib import Path
-from typing import List, Optional
+import os
+import re
+from pathlib import PurePath
+from typing import Callable, List, Optional, Sequence, Set, TextIO, Tuple
 from .linter import JenkinsfileLinter
 from . import __version__
 
+# fnmatch.translate() wraps its output as "(?s:...)\Z"; slice that off so
+# wildcards can't match the newlines standing in for path separators
+_FNMATCH_PREFIX, _FNMATCH_SUFFIX = fnmatch.translate("_").split("_")
+_FNMATCH_SLICE = slice(len(_FNMATCH_PREFIX), -len(_FNMATCH_SUFFIX))
+_MAGIC_RE = re.compile(r"[*?[]")
+
+# Set once stdout/stderr have been checked for UTF-8 on Windows
+_STREAMS_WRAPPED = False
+
+
+def _path_lines(filepath: str) -> str:
+    """Return a path with one component per line."""
+    path = str(PurePath(filepath))
+    return "" if path == "." else path.replace(os.sep, "\n")
+
+
+@functools.lru_cache(maxsize=256)
+def _translate_pattern(pattern: str) -> str:
+    """Translate a glob pattern into a regex with ``Path.match()`` semantics.
+
+    The regex is matched against the output of ``_path_lines()``. Relative
+    patterns match from the right, absolute patterns must match the whole path.
+
+    Args:
+        pattern: Glob pattern to translate
+
+    Returns:
+        Regular expression source for the pattern
+    """
+    path = PurePath(pattern)
+    if not path.parts:
+        raise ValueError("empty pattern")
+
+    parts = [r"\A" if path.anchor else "^"]
+    for part in _path_lines(pattern).splitlines(keepends=True):
+        if part == "*\n":
+            part = r".+\n"
+        elif part == "*":
+            part = r".+"
+        else:
+            # Negated classes like [!x] must not match the separator either
+            part = fnmatch.translate(part)[_FNMATCH_SLICE].replace("[^", r"[^\n")
+        parts.append(part)
+    parts.append(r"\Z")
+    return "".join(parts)
+
+
+def _build_matcher(
+    patterns: Optional[List[str]],
+) -> Optional[Callable[[str], bool]]:
+    """Compile glob patterns into a single predicate.
+
+    Args:
+        patterns: List of glob patterns, or None
+
+    Returns:
+        A function returning True if a path matches any of the patterns, or
+        None if no patterns were given
+    """
+    if not patterns:
+        return None
+    # Drop repeated patterns: on Python 3.10 fnmatch.translate() emits named
+    # groups, and the cached translation of a repeated pattern would define
+    # the same group names twice in the combined regex
+    return _compile_matcher(tuple(dict.fromkeys(patterns)))
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_matcher(patterns: Tuple[str, ...]) -> Callable[[str], bool]:
+    """Compile a non-empty tuple of glob patterns into a predicate.
+
+    Patterns that only constrain the file name are checked without a regex:
+    ``*.ext`` patterns with ``str.endswith()`` and plain names with a set
+    lookup. The remaining patterns are combined into one regex, so each file
+    is checked with a single search instead of one ``Path.match()`` call per
+    pattern. Matchers are cached, so repeated calls with the same patterns
+    don't compile them again.
+
+    Args:
+        patterns: Tuple of glob patterns
+
+    Returns:
+        A function returning True if a path matches any of the patterns
+    """
+    suffixes = []
+    names = set()
+    globs = []
+    for pattern in patterns:
+        path = PurePath(pattern)
+        if len(path.parts) == 1 and not path.anchor:
+            name = os.path.normcase(path.parts[0])
+            if not _MAGIC_RE.search(name):
+                names.add(name)
+                continue
+            if name[0] == "*" and len(name) > 1 and not _MAGIC_RE.search(name[1:]):
+                suffixes.append(name[1:])
+                continue
+        globs.append(pattern)
+
+    suffix_tuple = tuple(suffixes)
+    regex = None
+    if globs:
+        flags = re.MULTILINE
+        if os.name == "nt":
+            flags |= re.IGNORECASE
+        regex = re.compile(
+            "|".join(f"(?:{_translate_pattern(pattern)})" for pattern in globs),
+            flags,
+        )
+
+    def matcher(filepath: str) -> bool:
+        lines = _path_lines(filepath)
+        name = os.path.normcase(lines.rpartition("\n")[2])
+        return (
+            name.endswith(suffix_tuple)
+            or name in names
+            or (regex is not None and regex.search(lines) is not None)
+        )
+
+    return matcher
+
 
 def should_skip_file(filepath: str, skip_patterns: Optional[List[str]]) -> bool:
     """Check if a file should be skipped based on the provided patterns.
@@ -20,14 +145,8 @@ def should_skip_file(filepath: str, skip_patterns: Optional[List[str]]) -> bool:
     Returns:
         True if the file should be skipped, False otherwise
     """
-    if not skip_patterns:
-        return False
-
-    path = Path(filepath)
-    for pattern in skip_patterns:
-        if path.match(pattern):
-            return True
-    return False
+    matcher = _build_matcher(skip_patterns)
+    return matcher is not None and matcher(filepath)
 
 
 def should_include_file(filepath: str, include_patterns: Optional[List[str]]) -> bool:
@@ -43,36 +162,129 @@ def should_include_file(filepath: str, include_patterns: Optional[List[str]]) ->
     Returns:
         True if the file should be included, False otherwise
     """
-    if not include_patterns:
-        return True
-
-    path = Path(filepath)
-    for pattern in include_patterns:
-        if path.match(pattern):
-            return True
-    return False
-
-
-def main():
-    """Main entry point for the CLI."""
-    # Ensure stdout and stderr use UTF-8 encoding on Windows
-    # Only wrap if not already wrapped to avoid issues in tests
-    if sys.platform == "win32":
-        if (
-            not isinstance(sys.stdout, io.TextIOWrapper)
-            or sys.stdout.encoding.lower() != "utf-8"
-        ):
-            sys.stdout = io.TextIOWrapper(
-                sys.stdout.buffer, encoding="utf-8", errors="replace"
-            )
-        if (
-            not isinstance(sys.stderr, io.TextIOWrapper)
-            or sys.stderr.encoding.lower() != "utf-8"
-        ):
-            sys.stderr = io.TextIOWrapper(
-                sys.stderr.buffer, encoding="utf-8", errors="replace"
-            )
+    matcher = _build_matcher(include_patterns)
+    return matcher is None or matcher(filepath)
+
+
+def _skip_reason(
+    jenkinsfile: str,
+    include_matcher: Optional[Callable[[str], bool]],
+    skip_matcher: Optional[Callable[[str], bool]],
+) -> Optional[str]:
+    """Check whether a file should be skipped.
+
+    Args:
+        jenkinsfile: Path to the file to check
+        include_matcher: Matcher built from the --include patterns, or None
+        skip_matcher: Matcher built from the --skip patterns, or None
+
+    Returns:
+        Why the file is skipped, or None if it should be validated
+    """
+    # Check if file should be included (whitelist)
+    if include_matcher is not None and not include_matcher(jenkinsfile):
+        return "does not match include pattern"
+
+    # Check if file should be skipped (blacklist)
+    if skip_matcher is not None and skip_matcher(jenkinsfile):
+        return "matches skip pattern"
+
+    return None
+
+
+def _ensure_utf8_streams() -> None:
+    """Ensure stdout and stderr use UTF-8 encoding on Windows.
+
+    Only wraps the streams once per process, and only if they are not
+    already UTF-8 to avoid issues in tests.
+    """
+    global _STREAMS_WRAPPED
+    if _STREAMS_WRAPPED or sys.platform != "win32":
+        return
+
+    if (
+        not isinstance(sys.stdout, io.TextIOWrapper)
+        or sys.stdout.encoding.lower() != "utf-8"
+    ):
+        sys.stdout = io.TextIOWrapper(
+            sys.stdout.buffer, encoding="utf-8", errors="replace"
+        )
+    if (
+        not isinstance(sys.stderr, io.TextIOWrapper)
+        or sys.stderr.encoding.lower() != "utf-8"
+    ):
+        sys.stderr = io.TextIOWrapper(
+            sys.stderr.buffer, encoding="utf-8", errors="replace"
+        )
+    _STREAMS_WRAPPED = True
+
+
+class _DedupPrinter:
+    """Buffer lines for a stream, emitting each distinct line only once.
+
+    Repeated errors (e.g., a missing Jenkins URL reported for every file)
+    are dropped as they are emitted, and the remaining lines are written
+    to the stream in a single call on flush.
+    """
+
+    def __init__(self, stream: TextIO):
+        """Initialize the printer.
+
+        Args:
+            stream: Stream to write the collected lines to
+        """
+        self._stream = stream
+        self._seen: Set[str] = set()
+        self._lines: List[str] = []
+
+    def __bool__(self) -> bool:
+        """Return True once any line has been emitted."""
+        return bool(self._seen)
+
+    def emit(self, line: str) -> None:
+        """Queue a line unless an identical one was already emitted.
+
+        Args:
+            line: Line to print, without the trailing newline
+        """
+        if line not in self._seen:
+            self._seen.add(line)
+            self._lines.append(f"{line}\n")
+
+    def flush(self) -> None:
+        """Write the queued lines to the stream."""
+        self._stream.write("".join(self._lines))
+        self._lines.clear()
 
+
+def _positive_int(value: str) -> int:
+    """Parse a command-line value as an integer of at least 1.
+
+    Args:
+        value: Raw argument value
+
+    Returns:
+        The parsed integer
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a positive integer
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+@functools.lru_cache(maxsize=1)
+def _get_parser() -> argparse.ArgumentParser:
+    """Build the argument parser once and reuse it across invocations.
+
+    Returns:
+        The configured argument parser
+    """
     parser = argparse.ArgumentParser(
         description="Validate Jenkinsfiles using Jenkins API"
     )
@@ -122,53 +334,112 @@ def main():
         "matching at least one pattern are validated. Can be used multiple times. "
         "Example: --include 'Jenkinsfile*' --include 'pipelines/*.groovy'",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        default=8,
+        metavar="N",
+        help="Number of files to validate concurrently (default: 8)",
+    )
+
+    return parser
+
+
+def run(
+    argv: Optional[Sequence[str]] = None,
+    stdout: Optional[TextIO] = None,
+    stderr: Optional[TextIO] = None,
+) -> int:
+    """Run the linter CLI and return its exit code.
+
+    Args:
+        argv: Command line arguments, without the program name. Defaults to
+            sys.argv[1:]
+        stdout: Stream for the report. Defaults to sys.stdout
+        stderr: Stream for validation errors. Defaults to sys.stderr
+
+    Returns:
+        0 if every selected file is valid, 1 otherwise
+    """
+    # Resolve the streams at call time so replaced or captured streams
+    # are honoured
+    if stdout is None:
+        stdout = sys.stdout
+    if stderr is None:
+        stderr = sys.stderr
 
-    args = parser.parse_args()
+    args = _get_parser().parse_args(argv)
 
     # Create linter instance
     linter = JenkinsfileLinter(
         jenkins_url=args.jenkins_url,
         username=args.username,
         token=args.token,
+        pool_size=args.jobs,
     )
 
-    # Validate all provided files
-    all_valid = True
-    printed_messages = set()  # Track messages already printed for deduplication
+    # Compile the filter patterns once for all files
+    include_matcher = _build_matcher(args.include)
+    skip_matcher = _build_matcher(args.skip)
 
-    for jenkinsfile in args.jenkinsfile:
-        # Check if file should be included (whitelist)
-        if not should_include_file(jenkinsfile, args.include):
-            if args.verbose:
-                print(f"⊘ {jenkinsfile}: Skipped (does not match include pattern)")
-            continue
+    # Filter the files up front so only real work reaches the linter
+    skip_reasons = [
+        _skip_reason(jenkinsfile, include_matcher, skip_matcher)
+        for jenkinsfile in args.jenkinsfile
+    ]
+    files_to_check = [
+        jenkinsfile
+        for jenkinsfile, reason in zip(args.jenkinsfile, skip_reasons)
+        if reason is None
+    ]
+
+    # Validation is dominated by the HTTP round-trip to Jenkins, so the
+    # linter overlaps the requests. Results come back in input order.
+    results = iter(linter.validate_many(files_to_check))
 
-        # Check if file should be skipped (blacklist)
-        if should_skip_file(jenkinsfile, args.skip):
+    # Report in input order, as if the files had been validated one by one
+    out_lines = []
+    errors = _DedupPrinter(stderr)
+    for jenkinsfile, reason in zip(args.jenkinsfile, skip_reasons):
+        if reason is not None:
             if args.verbose:
-                print(f"⊘ {jenkinsfile}: Skipped (matches skip pattern)")
+                out_lines.append(f"⊘ {jenkinsfile}: Skipped ({reason})\n")
             continue
 
         if args.verbose:
-            print(f"Validating {jenkinsfile}...")
-
-        is_valid, message = linter.validate(jenkinsfile)
+            out_lines.append(f"Validating {jenkinsfile}...\n")
 
+        is_valid, message = next(results)
         if is_valid:
             # Show valid status for multiple files or when verbose
             if args.verbose or len(args.jenkinsfile) > 1:
-                print(f"✓ {jenkinsfile}: Valid")
+                out_lines.append(f"✓ {jenkinsfile}: Valid\n")
             if args.verbose and message:
-                print(f"  {message}")
+                out_lines.append(f"  {message}\n")
         else:
-            # Deduplicate error messages (e.g., credentials errors)
-            if message not in printed_messages:
-                print(f"  {message}", file=sys.stderr)
-                printed_messages.add(message)
-            all_valid = False
-
-    # Exit with appropriate code
-    sys.exit(0 if all_valid else 1)
+            # Write the report so far first, so the error follows the
+            # lines of the file it belongs to
+            stdout.write("".join(out_lines))
+            stdout.flush()
+            out_lines.clear()
+            errors.emit(f"  {message}")
+            errors.flush()
+
+    stdout.write("".join(out_lines))
+
+    return 1 if errors else 0
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Main entry point for the CLI.
+
+    Args:
+        argv: Command line arguments, without the program name. Defaults to
+            sys.argv[1:]
+    """
+    _ensure_utf8_streams()
+    sys.exit(run(argv, sys.stdout, sys.stderr))
 
 
 if __name__ == "__main__":
@@ -1,9 +1,38 @@
 #!/usr/bin/env python3
 """Core linter module for validating Jenkinsfiles."""
 
+import hashlib
 import os
+import re
+import threading
 import requests
-from typing import Tuple, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    # orjson parses bytes directly and is faster than the standard library
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# Common error patterns in Jenkins' plain-text validation responses, combined
+# into one regex so a response is scanned once
+_ERROR_RE = re.compile(
+    "|".join(
+        re.escape(indicator)
+        for indicator in (
+            "Errors",
+            "error",
+            "No Jenkinsfile specified",
+            "WorkflowScript:",  # Groovy compilation errors
+            "Expected",  # Syntax error patterns
+            "unexpected token",
+            "unable to resolve class",
+        )
+    )
+)
 
 
 class JenkinsfileLinter:
@@ -14,6 +43,7 @@ class JenkinsfileLinter:
         jenkins_url: Optional[str] = None,
         username: Optional[str] = None,
         token: Optional[str] = None,
+        pool_size: int = 8,
     ):
         """Initialize the linter.
 
@@ -21,10 +51,40 @@ class JenkinsfileLinter:
             jenkins_url: Jenkins server URL (optional, can be set via JENKINS_URL env var)
             username: Jenkins username (optional, can be set via JENKINS_USER env var)
             token: Jenkins API token (optional, can be set via JENKINS_TOKEN env var)
+            pool_size: Maximum number of concurrent requests to Jenkins
         """
         self.jenkins_url = jenkins_url or os.environ.get("JENKINS_URL")
         self.username = username or os.environ.get("JENKINS_USER")
         self.token = token or os.environ.get("JENKINS_TOKEN")
+        self._pool_size = pool_size
+        # Verdicts by content digest; a pending Future marks a request
+        # that is still in flight
+        self._cache: Dict[bytes, "Future[Tuple[bool, str]]"] = {}
+        self._cache_lock = threading.Lock()
+
+        # Reuse one session for all requests so connections (and TLS
+        # handshakes) to Jenkins are kept alive between files
+        self._session = requests.Session()
+        if self.username and self.token:
+            self._session.auth = (self.username, self.token)
+        if self.jenkins_url:
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=pool_size,
+                # Only retry on gateway errors; a timed-out or refused
+                # request is reported at once instead of being repeated
+                max_retries=Retry(
+                    total=2,
+                    connect=0,
+                    read=False,
+                    other=0,
+                    backoff_factor=0.2,
+                    status_forcelist=(502, 503, 504),
+                    allowed_methods=frozenset({"POST"}),
+                    raise_on_status=False,
+                ),
+            )
+            self._session.mount(self.jenkins_url, adapter)
 
     def _validate_with_jenkins(self, jenkinsfile_path: str) -> Tuple[bool, str]:
         """Validate Jenkinsfile using Jenkins API.
@@ -35,41 +95,105 @@ class JenkinsfileLinter:
         Returns:
             Tuple of (is_valid, message)
         """
+        # Read the Jenkinsfile content as bytes; requests sends them as-is.
+        # Opening the file directly also tells us whether it exists.
+        try:
+            with open(jenkinsfile_path, "rb") as f:
+                jenkinsfile_content = f.read()
+        except FileNotFoundError:
+            return False, f"File not found: {jenkinsfile_path}"
+        except OSError as e:
+            return False, f"Error reading file: {e}"
+
         if not self.jenkins_url:
             return (
                 False,
                 "Jenkins URL not provided. Set JENKINS_URL environment variable or pass --jenkins-url.",
             )
 
-        # Read the Jenkinsfile content
+        # Jenkins rejects empty files, no need to ask it. isspace() avoids
+        # the copy strip() would make of a large file.
+        if not jenkinsfile_content or jenkinsfile_content.isspace():
+            return False, "Jenkinsfile is empty"
+
+        # Identical files get the same verdict, so only ask Jenkins once
+        cache_key = hashlib.blake2b(jenkinsfile_content, digest_size=16).digest()
         try:
-            with open(jenkinsfile_path, "r", encoding="utf-8") as f:
-                jenkinsfile_content = f.read()
-        except IOError as e:
-            return False, f"Error reading file: {e}"
+            return self._request_validation(cache_key, jenkinsfile_content)
+        except requests.exceptions.RequestException as e:
+            return False, f"Error connecting to Jenkins: {e}"
+
+    def _request_validation(
+        self, cache_key: bytes, jenkinsfile_content: bytes
+    ) -> Tuple[bool, str]:
+        """Ask Jenkins to validate content, sharing the verdict by digest.
+
+        Callers validating the same content while a request is in flight
+        wait for that request instead of sending their own. Failed requests
+        are not remembered, so later callers try again.
+
+        Args:
+            cache_key: Digest of the Jenkinsfile content
+            jenkinsfile_content: Raw Jenkinsfile content
+
+        Returns:
+            Tuple of (is_valid, message)
+
+        Raises:
+            requests.exceptions.RequestException: If Jenkins cannot be reached
+        """
+        with self._cache_lock:
+            future = self._cache.get(cache_key)
+            if future is None:
+                future = self._cache[cache_key] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return future.result()
 
         # Prepare the validation endpoint
         validation_url = (
             f"{self.jenkins_url.rstrip('/')}/pipeline-model-converter/validate"
         )
 
-        # Prepare authentication
-        auth = None
-        if self.username and self.token:
-            auth = (self.username, self.token)
-
         try:
             # Send validation request
             # Jenkins expects 'jenkinsfile' as form data, not a file upload
             data = {"jenkinsfile": jenkinsfile_content}
-            response = requests.post(validation_url, data=data, auth=auth, timeout=30)
+            response = self._session.post(validation_url, data=data, timeout=30)
 
             # Check response
             response.raise_for_status()
+            result = self._parse_response(response)
+        except BaseException as e:
+            with self._cache_lock:
+                del self._cache[cache_key]
+            # Hand the failure to any waiting callers too
+            future.set_exception(e)
+            raise
+
+        future.set_result(result)
+        return result
+
+    def _parse_response(self, response: requests.Response) -> Tuple[bool, str]:
+        """Interpret the Jenkins validation response.
 
-            # Try to parse as JSON first for structured error handling
+        Args:
+            response: Successful response from the validation endpoint
+
+        Returns:
+            Tuple of (is_valid, message)
+        """
+        # Parse JSON responses for structured error handling; plain-text
+        # responses skip the JSON parser entirely
+        if "json" in response.headers.get("Content-Type", "").lower():
             try:
-                result_json = response.json()
+                result_json = _json_loads(response.content)
+            except ValueError:
+                # Malformed JSON, fall back to text parsing
+                pass
+            else:
                 # If JSON response, check for errors in structured format
                 if isinstance(result_json, dict):
                     if result_json.get("status") == "ok":
@@ -78,36 +202,22 @@ class JenkinsfileLinter:
                         # Extract error messages if available
                         errors = result_json.get("data", {}).get("errors", [])
                         if errors:
-                            error_msg = "\n".join([str(err) for err in errors])
+                            error_msg = "\n".join(map(str, errors))
                             return False, f"Validation errors:\n{error_msg}"
                         # If no errors list but status is not ok, return the whole response
                         return False, str(result_json)
                 else:
                     # JSON response is not a dict (e.g., a list), treat as valid if no errors
                     return True, str(result_json)
-            except ValueError:
-                # Not JSON, fall back to text parsing
-                result = response.text.strip()
-
-                # Check if there are errors in the response
-                # Common error patterns from Jenkins
-                error_indicators = [
-                    "Errors",
-                    "error",
-                    "No Jenkinsfile specified",
-                    "WorkflowScript:",  # Groovy compilation errors
-                    "Expected",  # Syntax error patterns
-                    "unexpected token",
-                    "unable to resolve class",
-                ]
-
-                if any(indicator in result for indicator in error_indicators):
-                    return False, result
-                else:
-                    return True, result
 
-        except requests.exceptions.RequestException as e:
-            return False, f"Error connecting to Jenkins: {e}"
+        # Not JSON, fall back to text parsing
+        result = response.text.strip()
+
+        # Check if there are errors in the response
+        if _ERROR_RE.search(result):
+            return False, result
+        else:
+            return True, result
 
     def validate(self, jenkinsfile_path: str) -> Tuple[bool, str]:
         """Validate a Jenkinsfile.
@@ -118,15 +228,25 @@ class JenkinsfileLinter:
         Returns:
             Tuple of (is_valid, message)
         """
-        # Check if file exists
-        if not os.path.isfile(jenkinsfile_path):
-            return False, f"File not found: {jenkinsfile_path}"
+        return self._validate_with_jenkins(jenkinsfile_path)
 
-        # Require Jenkins URL
-        if not self.jenkins_url:
-            return (
-                False,
-                "Jenkins URL not provided. Set JENKINS_URL environment variable or pass --jenkins-url.",
-            )
+    def validate_many(self, jenkinsfile_paths: Sequence[str]) -> List[Tuple[bool, str]]:
+        """Validate several Jenkinsfiles.
 
-        return self._validate_with_jenkins(jenkinsfile_path)
+        Jenkins validates one Jenkinsfile per request, so the requests are
+        sent concurrently over the shared session, up to ``pool_size`` at a
+        time.
+
+        Args:
+            jenkinsfile_paths: Paths to the Jenkinsfiles
+
+        Returns:
+            List of (is_valid, message) tuples, in the same order as the paths
+        """
+        # A pool only pays off when there is more than one request to overlap
+        if len(jenkinsfile_paths) <= 1 or self._pool_size <= 1:
+            return [self.validate(path) for path in jenkinsfile_paths]
+
+        workers = min(self._pool_size, len(jenkinsfile_paths))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.validate, jenkinsfile_paths))
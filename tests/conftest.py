@@ -1,103 +1,223 @@
 #!/usr/bin/env python3
 """Pytest configuration and fixtures."""
 
+import json
+import socket
+from dataclasses import dataclass
+from unittest.mock import mock_open, patch
+
 import pytest
-import tempfile
-import os
+
+# Import requests and the package up front so the cost of loading
+# requests/urllib3 is paid during collection rather than by whichever
+# test patches them first
+import requests  # noqa: F401
+import jenkinsfilelint.cli  # noqa: F401
+import jenkinsfilelint.linter  # noqa: F401
+
+VALID_JENKINSFILE = "pipeline { agent any }\n"
+
+EMPTY_JENKINSFILE = ""
+
+INVALID_JENKINSFILE = "// Just a comment\necho 'hello world'"
+
+LIBRARY_JENKINSFILE = """
+@Library('my-shared-library') _
+
+myCustomFunction()
+"""
+
+UTILS_GROOVY = "class Utils { }"
 
 
 @pytest.fixture(autouse=True)
-def clean_environment():
+def clean_environment(monkeypatch):
     """Clean Jenkins-related environment variables for all tests."""
-    jenkins_vars = ["JENKINS_URL", "JENKINS_USER", "JENKINS_TOKEN"]
-    # Save the original values
-    original_values = {k: os.environ.get(k) for k in jenkins_vars}
+    for var in ("JENKINS_URL", "JENKINS_USER", "JENKINS_TOKEN"):
+        monkeypatch.delenv(var, raising=False)
+
 
-    # Remove Jenkins variables
-    for var in jenkins_vars:
-        os.environ.pop(var, None)
+@pytest.fixture(autouse=True)
+def no_network(request, monkeypatch):
+    """Fail fast if a test tries to reach the network.
+
+    A mistyped patch target would otherwise let a test contact a real
+    Jenkins and hang on DNS or connection timeouts. Tests that really need
+    the network opt out with ``@pytest.mark.allow_net``.
+    """
+    if request.node.get_closest_marker("allow_net"):
+        return
 
-    yield
+    def guard(*args, **kwargs):
+        raise RuntimeError("network access is blocked in tests")
 
-    # Restore original values
-    for k, v in original_values.items():
-        if v is not None:
-            os.environ[k] = v
-        else:
-            os.environ.pop(k, None)
+    monkeypatch.setattr(socket, "getaddrinfo", guard)
+    monkeypatch.setattr(socket.socket, "connect", guard)
 
 
 @pytest.fixture
-def valid_jenkinsfile():
-    """Create a temporary valid Jenkinsfile."""
-    f = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".groovy")
-    f.write(
-        """
-pipeline {
-    agent any
-    stages {
-        stage('Build') {
-            steps {
-                sh 'echo Building'
-            }
-        }
-        stage('Test') {
-            steps {
-                sh 'echo Testing'
-            }
-        }
-    }
-}
-"""
-    )
-    f.flush()
-    f.close()
-    temp_path = f.name
+def jenkins_env(monkeypatch):
+    """Configure Jenkins URL and credentials through environment variables."""
+    monkeypatch.setenv("JENKINS_URL", "https://jenkins.env.com")
+    monkeypatch.setenv("JENKINS_USER", "envuser")
+    monkeypatch.setenv("JENKINS_TOKEN", "envtoken")
 
-    yield temp_path
-    os.unlink(temp_path)
 
+class FakeJenkinsResponse:
+    """Minimal stand-in for a requests.Response carrying a JSON body.
 
-@pytest.fixture
-def empty_jenkinsfile():
-    """Create a temporary empty Jenkinsfile."""
-    f = tempfile.NamedTemporaryFile(mode="w", delete=False)
-    f.write("")
-    f.flush()
-    f.close()
-    temp_path = f.name
+    Only provides what the linter reads, so it avoids the attribute and
+    call recording overhead of a Mock.
+    """
+
+    status_code = 200
+
+    def __init__(self, payload):
+        self.headers = {"Content-Type": "application/json"}
+        self.content = json.dumps(payload).encode()
+        self.text = self.content.decode()
+
+    def raise_for_status(self):
+        """Do nothing, as for a 200 response."""
 
-    yield temp_path
-    os.unlink(temp_path)
+
+@pytest.fixture(scope="session")
+def ok_jenkins_response():
+    """Build a successful Jenkins validation response shared by the session.
+
+    Tests only read from it; assertions are made on the patched POST mock.
+    """
+    return FakeJenkinsResponse({"status": "ok"})
 
 
 @pytest.fixture
-def invalid_jenkinsfile():
-    """Create a temporary invalid Jenkinsfile (no pipeline declaration)."""
-    f = tempfile.NamedTemporaryFile(mode="w", delete=False)
-    f.write("// Just a comment\necho 'hello world'")
-    f.flush()
-    f.close()
-    temp_path = f.name
+def in_memory_jenkinsfile():
+    """Serve the valid Jenkinsfile to the linter without touching the disk.
 
-    yield temp_path
-    os.unlink(temp_path)
+    Patches the ``open`` the linter reads files with, so any path reads as
+    ``VALID_JENKINSFILE``. For tests where the file content is irrelevant.
+    """
+    with patch(
+        "jenkinsfilelint.linter.open",
+        mock_open(read_data=VALID_JENKINSFILE.encode()),
+        create=True,
+    ):
+        yield "Jenkinsfile"
 
 
 @pytest.fixture
-def library_jenkinsfile():
-    """Create a temporary Jenkinsfile with @Library declaration."""
-    f = tempfile.NamedTemporaryFile(mode="w", delete=False)
-    f.write(
-        """
-@Library('my-shared-library') _
+def mock_post():
+    """Patch the linter's HTTP session POST; tests configure the reply."""
+    with patch("jenkinsfilelint.linter.requests.Session.post") as mock_post:
+        yield mock_post
 
-myCustomFunction()
-"""
-    )
-    f.flush()
-    f.close()
-    temp_path = f.name
 
-    yield temp_path
-    os.unlink(temp_path)
+@pytest.fixture
+def mock_jenkins_post(ok_jenkins_response):
+    """Patch the linter's HTTP session so every POST succeeds.
+
+    The mock is autospecced, so ``call_args[0][0]`` is the session that
+    sent the request.
+    """
+    with patch(
+        "jenkinsfilelint.linter.requests.Session.post", autospec=True
+    ) as mock_post:
+        mock_post.return_value = ok_jenkins_response
+        yield mock_post
+
+
+@pytest.fixture
+def mock_validate():
+    """Patch the linter so every file validates without reading it or using HTTP.
+
+    For CLI tests that only care which files reach the linter. The mock is
+    autospecced, so ``call_args[0][1]`` is the validated path.
+    """
+    with patch(
+        "jenkinsfilelint.linter.JenkinsfileLinter.validate",
+        autospec=True,
+        return_value=(True, "Jenkinsfile successfully validated"),
+    ) as mock:
+        yield mock
+
+
+@pytest.fixture(scope="session")
+def valid_jenkinsfile(tmp_path_factory):
+    """Create a valid Jenkinsfile shared by the whole test session."""
+    path = tmp_path_factory.mktemp("jenkinsfiles") / "valid.groovy"
+    path.write_text(VALID_JENKINSFILE)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def empty_jenkinsfile(tmp_path_factory):
+    """Create an empty Jenkinsfile shared by the whole test session."""
+    path = tmp_path_factory.mktemp("jenkinsfiles") / "empty"
+    path.write_text(EMPTY_JENKINSFILE)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def invalid_jenkinsfile(tmp_path_factory):
+    """Create an invalid Jenkinsfile (no pipeline declaration) shared by the session."""
+    path = tmp_path_factory.mktemp("jenkinsfiles") / "invalid"
+    path.write_text(INVALID_JENKINSFILE)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def library_jenkinsfile(tmp_path_factory):
+    """Create a Jenkinsfile with @Library declaration shared by the session."""
+    path = tmp_path_factory.mktemp("jenkinsfiles") / "library"
+    path.write_text(LIBRARY_JENKINSFILE)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def utils_groovy_file(tmp_path_factory):
+    """Create a plain Groovy class (not a pipeline) shared by the session."""
+    path = tmp_path_factory.mktemp("groovy") / "Utils.groovy"
+    path.write_text(UTILS_GROOVY)
+    return str(path)
+
+
+@dataclass(frozen=True)
+class SampleFiles:
+    """Paths to the read-only sample files of a small Jenkins workspace."""
+
+    jenkinsfile: str
+    utils_groovy: str
+    deploy_groovy: str
+    pipeline_groovy: str
+    helper_groovy: str
+
+
+@pytest.fixture(scope="session")
+def sample_files(tmp_path_factory):
+    """Create a small Jenkins workspace shared by the whole test session.
+
+    Layout::
+
+        Jenkinsfile
+        src/Utils.groovy
+        vars/deploy.groovy
+        vars/pipeline.groovy
+        vars/utils.groovy
+    """
+    root = tmp_path_factory.mktemp("samples")
+
+    def write(name, content):
+        path = root / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(content)
+        return str(path)
+
+    return SampleFiles(
+        jenkinsfile=write("Jenkinsfile", "pipeline { agent any }"),
+        utils_groovy=write("src/Utils.groovy", UTILS_GROOVY),
+        deploy_groovy=write(
+            "vars/deploy.groovy", "pipeline { agent { label 'deploy' } }"
+        ),
+        pipeline_groovy=write("vars/pipeline.groovy", "pipeline { agent none }"),
+        helper_groovy=write("vars/utils.groovy", "def call() { }"),
+    )
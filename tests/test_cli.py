@@ -1,677 +1,476 @@
 #!/usr/bin/env python3
 """Tests for the CLI module."""
 
-import os
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
 import pytest
-import tempfile
+from pathlib import Path
 from unittest.mock import patch, Mock
+from jenkinsfilelint import cli
 from jenkinsfilelint.cli import main, should_skip_file, should_include_file
 
 
+def assert_credentials_error(err):
+    """Assert that stderr reports the missing Jenkins URL exactly once."""
+    assert err.lower().count("jenkins url not provided") == 1
+
+
 class TestCLIMain:
     """Test the CLI main function."""
 
     def test_help_message(self):
         """Test that help message is displayed."""
-        with patch("sys.argv", ["jenkinsfilelint", "--help"]):
-            with pytest.raises(SystemExit) as exc_info:
-                main()
-            assert exc_info.value.code == 0
-
-    def test_validate_single_valid_file(self, capsys):
-        """Test validation of a single valid file requires credentials."""
-        f = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".groovy")
-        f.write("pipeline { agent any }")
-        f.flush()
-        f.close()
-        temp_path = f.name
-
-        try:
-            with patch("sys.argv", ["jenkinsfilelint", temp_path]):
-                with pytest.raises(SystemExit) as exc_info:
-                    main()
-                assert exc_info.value.code == 1
-
-            captured = capsys.readouterr()
-            assert "jenkins url not provided" in captured.err.lower()
-        finally:
-            os.unlink(temp_path)
-
-    def test_validate_single_invalid_file(self, capsys):
-        """Test validation of a single invalid file."""
-        f = tempfile.NamedTemporaryFile(mode="w", delete=False)
-        f.write("")  # Empty file
-        f.flush()
-        f.close()
-        temp_path = f.name
-
-        try:
-            with patch("sys.argv", ["jenkinsfilelint", temp_path]):
-                with pytest.raises(SystemExit) as exc_info:
-                    main()
-                assert exc_info.value.code == 1
-
-            captured = capsys.readouterr()
-            # Error message is printed without filename prefix for deduplication
-            assert "jenkins url not provided" in captured.err.lower()
-        finally:
-            os.unlink(temp_path)
-
-    def test_validate_multiple_files(self, capsys):
-        """Test validation of multiple files requires credentials.
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--help"])
+        assert exc_info.value.code == 0
+
+    def test_main_exits_with_run_exit_code(self, capsys, valid_jenkinsfile):
+        """Test that main() exits with the code returned for the given argv."""
+        with pytest.raises(SystemExit) as exc_info:
+            main([valid_jenkinsfile])
+        assert exc_info.value.code == 1
+
+        assert_credentials_error(capsys.readouterr().err)
+
+    @pytest.mark.parametrize(
+        "url_args, expected_code",
+        [
+            ([], 1),
+            (["--jenkins-url", "https://jenkins.example.com"], 0),
+        ],
+        ids=["without-url", "with-url"],
+    )
+    def test_validate_single_valid_file(
+        self, mock_jenkins_post, capsys, valid_jenkinsfile, url_args, expected_code
+    ):
+        """Test validation of a single valid file with and without a Jenkins URL."""
+        assert cli.run([*url_args, valid_jenkinsfile]) == expected_code
+        assert mock_jenkins_post.call_count == (1 if url_args else 0)
+
+        captured = capsys.readouterr()
+        if url_args:
+            assert captured.err == ""
+        else:
+            assert_credentials_error(captured.err)
+
+    @pytest.mark.parametrize(
+        "files, extra_args",
+        [
+            (["empty_jenkinsfile"], []),
+            (["valid_jenkinsfile", "library_jenkinsfile"], []),
+            (["valid_jenkinsfile", "empty_jenkinsfile"], []),
+            (["valid_jenkinsfile"], ["--verbose"]),
+        ],
+        ids=["empty", "multiple", "multiple-with-invalid", "verbose"],
+    )
+    def test_validate_requires_credentials(self, request, files, extra_args):
+        """Test that validation without a Jenkins URL fails for any file set.
 
         Error messages should be deduplicated - the same error should only
         appear once even when multiple files have the same error.
         """
-        f1 = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix="1.groovy")
-        f1.write("pipeline { agent any }")
-        f1.flush()
-        f1.close()
-        temp_path1 = f1.name
-
-        f2 = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix="2.groovy")
-        f2.write("@Library('lib') _\necho 'test'")
-        f2.flush()
-        f2.close()
-        temp_path2 = f2.name
-
-        try:
-            with patch("sys.argv", ["jenkinsfilelint", temp_path1, temp_path2]):
-                with pytest.raises(SystemExit) as exc_info:
-                    main()
-                assert exc_info.value.code == 1
-
-            captured = capsys.readouterr()
-            # Verify the error is present
-            assert "jenkins url not provided" in captured.err.lower()
-            # Verify deduplication - the credentials message should appear exactly once
-            assert captured.err.lower().count("jenkins url not provided") == 1
-        finally:
-            os.unlink(temp_path1)
-            os.unlink(temp_path2)
-
-    def test_validate_multiple_files_with_one_invalid(self, capsys):
-        """Test validation of multiple files where one is invalid."""
-        f1 = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix="1.groovy")
-        f1.write("pipeline { agent any }")
-        f1.flush()
-        f1.close()
-        temp_path1 = f1.name
-
-        f2 = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix="2.groovy")
-        f2.write("")  # Empty file
-        f2.flush()
-        f2.close()
-        temp_path2 = f2.name
-
-        try:
-            with patch("sys.argv", ["jenkinsfilelint", temp_path1, temp_path2]):
-                with pytest.raises(SystemExit) as exc_info:
-                    main()
-                assert exc_info.value.code == 1
-        finally:
-            os.unlink(temp_path1)
-            os.unlink(temp_path2)
-
-    def test_validate_with_verbose_flag(self, capsys):
-        """Test validation with verbose output requires credentials."""
-        f = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".groovy")
-        f.write("pipeline { agent any }")
-        f.flush()
-        f.close()
-        temp_path = f.name
-
-        try:
-            with patch("sys.argv", ["jenkinsfilelint", "--verbose", temp_path]):
-                with pytest.raises(SystemExit) as exc_info:
-                    main()
-                assert exc_info.value.code == 1
-
-            captured = capsys.readouterr()
-            assert "Validating" in captured.out
-            assert "jenkins url not provided" in captured.err.lower()
-        finally:
-            os.unlink(temp_path)
-
-    def test_validate_verbose_shows_message_on_success(self, capsys):
+        paths = [request.getfixturevalue(name) for name in files]
+        out, err = io.StringIO(), io.StringIO()
+        assert cli.run([*extra_args, *paths], out, err) == 1
+
+        # Error message is printed without filename prefix for deduplication
+        assert_credentials_error(err.getvalue())
+        if "--verbose" in extra_args:
+            assert "Validating" in out.getvalue()
+        else:
+            assert out.getvalue() == ""
+
+    def test_validate_verbose_shows_message_on_success(
+        self, mock_validate, capsys, valid_jenkinsfile
+    ):
         """Test that verbose mode prints the validation message on success."""
-        f = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".groovy")
-        f.write("pipeline { agent any }")
-        f.flush()
-        f.close()
-        temp_path = f.name
-
-        try:
-            with patch(
-                "sys.argv",
-                [
-                    "jenkinsfilelint",
-                    "--verbose",
-                    "--jenkins-url",
-                    "https://jenkins.example.com",
-                    temp_path,
-                ],
-            ):
-                with patch("jenkinsfilelint.linter.requests.post") as mock_post:
-                    mock_response = Mock()
-                    mock_response.status_code = 200
-                    mock_response.json.return_value = {"status": "ok"}
-                    mock_response.raise_for_status = Mock()
-                    mock_post.return_value = mock_response
-
-                    with pytest.raises(SystemExit) as exc_info:
-                        main()
-                    assert exc_info.value.code == 0
-
-            captured = capsys.readouterr()
-            assert "Validating" in captured.out
-            assert "Jenkinsfile successfully validated" in captured.out
-        finally:
-            os.unlink(temp_path)
-
-    def test_validate_with_jenkins_url_argument(self):
-        """Test validation with Jenkins URL argument."""
-        f = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".groovy")
-        f.write("pipeline { agent any }")
-        f.flush()
-        f.close()
-        temp_path = f.name
-
-        try:
-            with patch(
-                "sys.argv",
-                [
-                    "jenkinsfilelint",
-                    "--jenkins-url",
-                    "https://jenkins.example.com",
-                    temp_path,
-                ],
-            ):
-                with patch("jenkinsfilelint.linter.requests.post") as mock_post:
-                    mock_response = Mock()
-                    mock_response.status_code = 200
-                    mock_response.json.return_value = {"status": "ok"}
-                    mock_response.raise_for_status = Mock()
-                    mock_post.return_value = mock_response
-
-                    with pytest.raises(SystemExit) as exc_info:
-                        main()
-                    assert exc_info.value.code == 0
-                    mock_post.assert_called_once()
-        finally:
-            os.unlink(temp_path)
-
-    def test_validate_with_username_and_token_arguments(self):
+        exit_code = cli.run(
+            [
+                "--verbose",
+                "--jenkins-url",
+                "https://jenkins.example.com",
+                valid_jenkinsfile,
+            ]
+        )
+        assert exit_code == 0
+
+        captured = capsys.readouterr()
+        assert "Validating" in captured.out
+        assert "Jenkinsfile successfully validated" in captured.out
+
+    def test_validate_with_username_and_token_arguments(
+        self, mock_jenkins_post, valid_jenkinsfile
+    ):
         """Test validation with username and token arguments."""
-        f = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".groovy")
-        f.write("pipeline { agent any }")
-        f.flush()
-        f.close()
-        temp_path = f.name
-
-        try:
-            with patch(
-                "sys.argv",
+        exit_code = cli.run(
+            [
+                "--jenkins-url",
+                "https://jenkins.example.com",
+                "--username",
+                "testuser",
+                "--token",
+                "testtoken",
+                valid_jenkinsfile,
+            ]
+        )
+        assert exit_code == 0
+
+        # Verify authentication was used
+        session = mock_jenkins_post.call_args[0][0]
+        assert session.auth == ("testuser", "testtoken")
+
+    def test_validate_multiple_files_in_parallel(self, mock_validate, capsys, tmp_path):
+        """Test that --jobs validates files in a pool but reports in order."""
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"{i}.groovy"
+            path.write_text(f"pipeline {{ agent {{ label 'node{i}' }} }}")
+            paths.append(str(path))
+
+        with patch(
+            "jenkinsfilelint.linter.ThreadPoolExecutor", wraps=ThreadPoolExecutor
+        ) as mock_executor:
+            exit_code = cli.run(
                 [
-                    "jenkinsfilelint",
                     "--jenkins-url",
                     "https://jenkins.example.com",
-                    "--username",
-                    "testuser",
-                    "--token",
-                    "testtoken",
-                    temp_path,
-                ],
-            ):
-                with patch("jenkinsfilelint.linter.requests.post") as mock_post:
-                    mock_response = Mock()
-                    mock_response.status_code = 200
-                    mock_response.json.return_value = {"status": "ok"}
-                    mock_response.raise_for_status = Mock()
-                    mock_post.return_value = mock_response
-
-                    with pytest.raises(SystemExit) as exc_info:
-                        main()
-                    assert exc_info.value.code == 0
-
-                    # Verify authentication was used
-                    call_kwargs = mock_post.call_args[1]
-                    assert call_kwargs["auth"] == ("testuser", "testtoken")
-        finally:
-            os.unlink(temp_path)
+                    "--jobs",
+                    "3",
+                    *paths,
+                ]
+            )
+        assert exit_code == 0
+        assert mock_validate.call_count == 3
+        mock_executor.assert_called_once_with(max_workers=3)
+
+        captured = capsys.readouterr()
+        lines = captured.out.splitlines()
+        assert lines == [f"✓ {path}: Valid" for path in paths]
+
+    def test_verbose_report_keeps_errors_next_to_their_file(
+        self, mock_validate, valid_jenkinsfile, invalid_jenkinsfile, utils_groovy_file
+    ):
+        """Test that each file's lines, including errors, are reported in order."""
+
+        def validate(linter, path):
+            if path == invalid_jenkinsfile:
+                return False, "WorkflowScript: 1: unexpected token"
+            return True, ""
+
+        mock_validate.side_effect = validate
+        # Share one stream so the order across stdout and stderr is visible
+        stream = io.StringIO()
+        exit_code = cli.run(
+            [
+                "--verbose",
+                "--jenkins-url",
+                "https://jenkins.example.com",
+                "--skip",
+                "Utils.groovy",
+                valid_jenkinsfile,
+                utils_groovy_file,
+                invalid_jenkinsfile,
+                valid_jenkinsfile,
+            ],
+            stream,
+            stream,
+        )
+        assert exit_code == 1
+        assert stream.getvalue().splitlines() == [
+            f"Validating {valid_jenkinsfile}...",
+            f"✓ {valid_jenkinsfile}: Valid",
+            f"⊘ {utils_groovy_file}: Skipped (matches skip pattern)",
+            f"Validating {invalid_jenkinsfile}...",
+            "  WorkflowScript: 1: unexpected token",
+            f"Validating {valid_jenkinsfile}...",
+            f"✓ {valid_jenkinsfile}: Valid",
+        ]
+
+    @pytest.mark.parametrize("jobs", ["0", "-5", "many"])
+    def test_jobs_must_be_a_positive_int(self, capsys, jobs):
+        """Test that --jobs values below 1 are rejected by the parser."""
+        with pytest.raises(SystemExit) as exc_info:
+            cli.run(["--jobs", jobs, "Jenkinsfile"])
+        assert exc_info.value.code == 2
+        assert "--jobs" in capsys.readouterr().err
 
     def test_validate_nonexistent_file(self, capsys):
         """Test validation of a nonexistent file."""
-        with patch("sys.argv", ["jenkinsfilelint", "/nonexistent/file.groovy"]):
-            with pytest.raises(SystemExit) as exc_info:
-                main()
-            assert exc_info.value.code == 1
+        assert cli.run(["/nonexistent/file.groovy"]) == 1
 
         captured = capsys.readouterr()
         assert "File not found" in captured.err
 
-    def test_validate_with_env_variables(self):
+    def test_parser_is_reused_without_leaking_state(self):
+        """Test that the cached parser does not carry options between runs."""
+        assert cli._get_parser() is cli._get_parser()
+
+        first = cli._get_parser().parse_args(["--skip", "*.groovy", "Jenkinsfile"])
+        second = cli._get_parser().parse_args(["Jenkinsfile"])
+        assert first.skip == ["*.groovy"]
+        assert second.skip == []
+
+    def test_validate_with_env_variables(
+        self, mock_jenkins_post, jenkins_env, valid_jenkinsfile
+    ):
         """Test validation using environment variables for configuration."""
-        f = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".groovy")
-        f.write("pipeline { agent any }")
-        f.flush()
-        f.close()
-        temp_path = f.name
-
-        try:
-            with patch.dict(
-                os.environ,
-                {
-                    "JENKINS_URL": "https://jenkins.env.com",
-                    "JENKINS_USER": "envuser",
-                    "JENKINS_TOKEN": "envtoken",
-                },
-            ):
-                with patch("sys.argv", ["jenkinsfilelint", temp_path]):
-                    with patch("jenkinsfilelint.linter.requests.post") as mock_post:
-                        mock_response = Mock()
-                        mock_response.status_code = 200
-                        mock_response.json.return_value = {"status": "ok"}
-                        mock_response.raise_for_status = Mock()
-                        mock_post.return_value = mock_response
-
-                        with pytest.raises(SystemExit) as exc_info:
-                            main()
-                        assert exc_info.value.code == 0
-
-                        # Verify Jenkins API was called
-                        mock_post.assert_called_once()
-                        call_kwargs = mock_post.call_args[1]
-                        assert call_kwargs["auth"] == ("envuser", "envtoken")
-        finally:
-            os.unlink(temp_path)
+        assert cli.run([valid_jenkinsfile]) == 0
+
+        # Verify Jenkins API was called
+        mock_jenkins_post.assert_called_once()
+        session = mock_jenkins_post.call_args[0][0]
+        assert session.auth == ("envuser", "envtoken")
+
+
+class TestDedupPrinter:
+    """Test the deduplicating error printer."""
+
+    def test_emits_each_line_once_in_order(self):
+        """Test that repeated lines are dropped and order is kept."""
+        stream = io.StringIO()
+        printer = cli._DedupPrinter(stream)
+        assert not printer
+
+        for line in ["  first", "  second", "  first"]:
+            printer.emit(line)
+        assert printer
+        assert stream.getvalue() == ""
+
+        printer.flush()
+        assert stream.getvalue() == "  first\n  second\n"
 
 
 class TestShouldSkipFile:
     """Test the should_skip_file function."""
 
-    def test_no_skip_patterns(self):
-        """Test that no file is skipped when no patterns are provided."""
-        assert should_skip_file("src/MyClass.groovy", []) is False
-        assert should_skip_file("Jenkinsfile", []) is False
-        assert should_skip_file("Jenkinsfile", None) is False
-
-    def test_exact_match(self):
-        """Test exact filename match."""
-        assert should_skip_file("src/Utils.groovy", ["src/Utils.groovy"]) is True
-        assert should_skip_file("src/Other.groovy", ["src/Utils.groovy"]) is False
-
-    def test_glob_pattern_wildcard(self):
-        """Test glob pattern with wildcard."""
-        assert should_skip_file("src/Utils.groovy", ["*.groovy"]) is True
-        assert should_skip_file("src/Utils.groovy", ["src/*.groovy"]) is True
-        assert should_skip_file("Jenkinsfile", ["*.groovy"]) is False
-
-    def test_glob_pattern_double_wildcard(self):
-        """Test glob pattern with directory wildcard."""
-        patterns = ["*/src/*.groovy"]
-        assert should_skip_file("lib/src/MyClass.groovy", patterns) is True
-        assert should_skip_file("vars/deploy.groovy", patterns) is False
-
-    def test_multiple_patterns(self):
-        """Test multiple skip patterns."""
-        patterns = ["*/src/*.groovy", "vars/*.groovy"]
-        assert should_skip_file("lib/src/MyClass.groovy", patterns) is True
-        assert should_skip_file("vars/deploy.groovy", patterns) is True
-        assert should_skip_file("Jenkinsfile", patterns) is False
+    @pytest.mark.parametrize(
+        "path, patterns, expected",
+        [
+            # No patterns
+            ("src/MyClass.groovy", [], False),
+            ("Jenkinsfile", [], False),
+            ("Jenkinsfile", None, False),
+            # Exact filename match
+            ("src/Utils.groovy", ["src/Utils.groovy"], True),
+            ("src/Other.groovy", ["src/Utils.groovy"], False),
+            # Glob pattern with wildcard
+            ("src/Utils.groovy", ["*.groovy"], True),
+            ("src/Utils.groovy", ["src/*.groovy"], True),
+            ("Jenkinsfile", ["*.groovy"], False),
+            # Glob pattern with directory wildcard
+            ("lib/src/MyClass.groovy", ["*/src/*.groovy"], True),
+            ("vars/deploy.groovy", ["*/src/*.groovy"], False),
+            # Multiple patterns
+            ("lib/src/MyClass.groovy", ["*/src/*.groovy", "vars/*.groovy"], True),
+            ("vars/deploy.groovy", ["*/src/*.groovy", "vars/*.groovy"], True),
+            ("Jenkinsfile", ["*/src/*.groovy", "vars/*.groovy"], False),
+            # Repeated multi-star pattern
+            ("x/aXbYc", ["a*b*c", "a*b*c"], True),
+        ],
+    )
+    def test_skip(self, path, patterns, expected):
+        """Test which paths are skipped for a set of patterns."""
+        assert should_skip_file(path, patterns) is expected
+
+    def test_matches_path_match_semantics(self):
+        """Test that compiled patterns agree with Path.match()."""
+        paths = [
+            "Jenkinsfile",
+            "Jenkinsfile.prod",
+            "src/Utils.groovy",
+            "lib/src/MyClass.groovy",
+            "/abs/vars/deploy.groovy",
+            "./src/Other.groovy",
+        ]
+        patterns = [
+            "*",
+            "*/*",
+            "*.groovy",
+            "src/*.groovy",
+            "*/src/*.groovy",
+            "/abs/*/*.groovy",
+            "/*",
+            "[JK]enkinsfile?*",
+            "src/Utils.groovy",
+            "Jenkinsfile",
+            "*.prod",
+            "vars[!_]*.groovy",
+            "src[!x]Utils.groovy",
+            "*/[!.]*.groovy",
+        ]
+        for path in paths:
+            for pattern in patterns:
+                assert should_skip_file(path, [pattern]) is Path(path).match(pattern), (
+                    path,
+                    pattern,
+                )
+
+    def test_empty_pattern(self):
+        """Test that an empty pattern is rejected like Path.match()."""
+        with pytest.raises(ValueError):
+            should_skip_file("Jenkinsfile", [""])
 
 
 class TestCLISkipOption:
     """Test the CLI --skip option."""
 
-    def test_skip_single_file(self, capsys):
+    def test_skip_single_file(self, utils_groovy_file):
         """Test skipping a single file with --skip option."""
-        f = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".groovy")
-        f.write("class Utils { }")  # Pure Groovy, not a pipeline
-        f.flush()
-        f.close()
-        temp_path = f.name
-
-        try:
-            with patch(
-                "sys.argv",
-                ["jenkinsfilelint", "--skip", "*.groovy", temp_path],
-            ):
-                with pytest.raises(SystemExit) as exc_info:
-                    main()
-                # Should exit 0 because the only file was skipped
-                assert exc_info.value.code == 0
-        finally:
-            os.unlink(temp_path)
-
-    def test_skip_single_file_verbose(self, capsys):
+        assert cli.run(["--skip", "*.groovy", utils_groovy_file]) == 0
+
+    def test_skip_single_file_verbose(self, capsys, utils_groovy_file):
         """Test skipping a file with verbose output."""
-        f = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".groovy")
-        f.write("class Utils { }")
-        f.flush()
-        f.close()
-        temp_path = f.name
-
-        try:
-            with patch(
-                "sys.argv",
-                ["jenkinsfilelint", "--verbose", "--skip", "*.groovy", temp_path],
-            ):
-                with pytest.raises(SystemExit) as exc_info:
-                    main()
-                assert exc_info.value.code == 0
-
-            captured = capsys.readouterr()
-            assert "Skipped" in captured.out
-            assert "matches skip pattern" in captured.out
-        finally:
-            os.unlink(temp_path)
-
-    def test_skip_some_files_validate_others(self, capsys):
-        """Test skipping some files while validating others."""
-        # Create a groovy file to skip
-        groovy_dir = tempfile.mkdtemp()
-        groovy_file = os.path.join(groovy_dir, "Utils.groovy")
-        with open(groovy_file, "w") as f:
-            f.write("class Utils { }")
-
-        # Create a Jenkinsfile to validate
-        jenkinsfile = tempfile.NamedTemporaryFile(
-            mode="w", delete=False, prefix="Jenkinsfile"
-        )
-        jenkinsfile.write("pipeline { agent any }")
-        jenkinsfile.flush()
-        jenkinsfile.close()
-        jenkinsfile_path = jenkinsfile.name
-
-        try:
-            with patch(
-                "sys.argv",
-                [
-                    "jenkinsfilelint",
-                    "--jenkins-url",
-                    "https://jenkins.example.com",
-                    "--skip",
-                    "*.groovy",
-                    groovy_file,
-                    jenkinsfile_path,
-                ],
-            ):
-                with patch("jenkinsfilelint.linter.requests.post") as mock_post:
-                    mock_response = Mock()
-                    mock_response.status_code = 200
-                    mock_response.json.return_value = {"status": "ok"}
-                    mock_response.raise_for_status = Mock()
-                    mock_post.return_value = mock_response
-
-                    with pytest.raises(SystemExit) as exc_info:
-                        main()
-                    assert exc_info.value.code == 0
-                    # Only Jenkinsfile should be validated, groovy file skipped
-                    mock_post.assert_called_once()
-        finally:
-            os.unlink(groovy_file)
-            os.rmdir(groovy_dir)
-            os.unlink(jenkinsfile_path)
-
-    def test_multiple_skip_patterns(self, capsys):
-        """Test using multiple --skip options."""
-        # Create files in temp directories
-        src_dir = tempfile.mkdtemp()
-        vars_dir = tempfile.mkdtemp()
+        assert cli.run(["--verbose", "--skip", "*.groovy", utils_groovy_file]) == 0
 
-        src_file = os.path.join(src_dir, "Utils.groovy")
-        with open(src_file, "w") as f:
-            f.write("class Utils { }")
+        captured = capsys.readouterr()
+        assert "Skipped" in captured.out
+        assert "matches skip pattern" in captured.out
 
-        vars_file = os.path.join(vars_dir, "deploy.groovy")
-        with open(vars_file, "w") as f:
-            f.write("def call() { }")
+    def test_skip_some_files_validate_others(self, mock_validate, sample_files):
+        """Test skipping some files while validating others."""
+        exit_code = cli.run(
+            [
+                "--jenkins-url",
+                "https://jenkins.example.com",
+                "--skip",
+                "*.groovy",
+                sample_files.utils_groovy,
+                sample_files.jenkinsfile,
+            ]
+        )
+        assert exit_code == 0
+        # Only Jenkinsfile should be validated, groovy file skipped
+        mock_validate.assert_called_once()
+        assert mock_validate.call_args[0][1] == sample_files.jenkinsfile
 
-        try:
-            with patch(
-                "sys.argv",
-                [
-                    "jenkinsfilelint",
-                    "--skip",
-                    "*/Utils.groovy",
-                    "--skip",
-                    "*/deploy.groovy",
-                    src_file,
-                    vars_file,
-                ],
-            ):
-                with pytest.raises(SystemExit) as exc_info:
-                    main()
-                # Both files skipped, so exit 0
-                assert exc_info.value.code == 0
-        finally:
-            os.unlink(src_file)
-            os.unlink(vars_file)
-            os.rmdir(src_dir)
-            os.rmdir(vars_dir)
+    def test_multiple_skip_patterns(self, sample_files):
+        """Test using multiple --skip options."""
+        exit_code = cli.run(
+            [
+                "--skip",
+                "*/Utils.groovy",
+                "--skip",
+                "*/deploy.groovy",
+                sample_files.utils_groovy,
+                sample_files.deploy_groovy,
+            ]
+        )
+        assert exit_code == 0
 
 
 class TestShouldIncludeFile:
     """Test the should_include_file function."""
 
-    def test_no_include_patterns_includes_all(self):
-        """Test that all files are included when no patterns are provided."""
-        assert should_include_file("src/MyClass.groovy", []) is True
-        assert should_include_file("Jenkinsfile", []) is True
-        assert should_include_file("Jenkinsfile", None) is True
-
-    def test_exact_match(self):
-        """Test exact filename match."""
-        assert should_include_file("Jenkinsfile", ["Jenkinsfile"]) is True
-        assert should_include_file("src/Other.groovy", ["Jenkinsfile"]) is False
-
-    def test_glob_pattern_wildcard(self):
-        """Test glob pattern with wildcard."""
-        assert (
-            should_include_file("pipelines/deploy.groovy", ["pipelines/*.groovy"])
-            is True
-        )
-        assert should_include_file("src/Utils.groovy", ["pipelines/*.groovy"]) is False
-
-    def test_glob_pattern_prefix(self):
-        """Test Jenkinsfile* pattern."""
-        assert should_include_file("Jenkinsfile", ["Jenkinsfile*"]) is True
-        assert should_include_file("Jenkinsfile.prod", ["Jenkinsfile*"]) is True
-        assert should_include_file("src/Utils.groovy", ["Jenkinsfile*"]) is False
-
-    def test_multiple_patterns(self):
-        """Test multiple include patterns (any match includes the file)."""
-        patterns = ["Jenkinsfile*", "pipelines/*.groovy"]
-        assert should_include_file("Jenkinsfile", patterns) is True
-        assert should_include_file("Jenkinsfile.prod", patterns) is True
-        assert should_include_file("pipelines/deploy.groovy", patterns) is True
-        assert should_include_file("src/Utils.groovy", patterns) is False
+    @pytest.mark.parametrize(
+        "path, patterns, expected",
+        [
+            # No patterns includes everything
+            ("src/MyClass.groovy", [], True),
+            ("Jenkinsfile", [], True),
+            ("Jenkinsfile", None, True),
+            # Exact filename match
+            ("Jenkinsfile", ["Jenkinsfile"], True),
+            ("src/Other.groovy", ["Jenkinsfile"], False),
+            # Glob pattern with wildcard
+            ("pipelines/deploy.groovy", ["pipelines/*.groovy"], True),
+            ("src/Utils.groovy", ["pipelines/*.groovy"], False),
+            # Jenkinsfile* prefix pattern
+            ("Jenkinsfile", ["Jenkinsfile*"], True),
+            ("Jenkinsfile.prod", ["Jenkinsfile*"], True),
+            ("src/Utils.groovy", ["Jenkinsfile*"], False),
+            # Multiple patterns (any match includes the file)
+            ("Jenkinsfile", ["Jenkinsfile*", "pipelines/*.groovy"], True),
+            ("Jenkinsfile.prod", ["Jenkinsfile*", "pipelines/*.groovy"], True),
+            ("pipelines/deploy.groovy", ["Jenkinsfile*", "pipelines/*.groovy"], True),
+            ("src/Utils.groovy", ["Jenkinsfile*", "pipelines/*.groovy"], False),
+        ],
+    )
+    def test_include(self, path, patterns, expected):
+        """Test which paths are included for a set of patterns."""
+        assert should_include_file(path, patterns) is expected
 
 
 class TestCLIIncludeOption:
     """Test the CLI --include option."""
 
-    def test_include_matches_file(self, capsys):
+    def test_include_matches_file(self, capsys, sample_files):
         """Test that only files matching --include are validated."""
-        f = tempfile.NamedTemporaryFile(
-            mode="w", delete=False, prefix="Jenkinsfile", suffix=""
-        )
-        f.write("pipeline { agent any }")
-        f.flush()
-        f.close()
-        temp_path = f.name
-
-        try:
-            with patch(
-                "sys.argv",
-                ["jenkinsfilelint", "--include", "Jenkinsfile*", temp_path],
-            ):
-                with pytest.raises(SystemExit) as exc_info:
-                    main()
-                # No Jenkins URL → credentials error → exit 1
-                assert exc_info.value.code == 1
-
-            captured = capsys.readouterr()
-            assert "jenkins url not provided" in captured.err.lower()
-        finally:
-            os.unlink(temp_path)
-
-    def test_include_skips_non_matching_file(self, capsys):
+        assert cli.run(["--include", "Jenkinsfile*", sample_files.jenkinsfile]) == 1
+
+        assert_credentials_error(capsys.readouterr().err)
+
+    def test_include_skips_non_matching_file(self, utils_groovy_file):
         """Test that files not matching --include are skipped."""
-        f = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".groovy")
-        f.write("class Utils { }")
-        f.flush()
-        f.close()
-        temp_path = f.name
-
-        try:
-            with patch(
-                "sys.argv",
-                ["jenkinsfilelint", "--include", "Jenkinsfile*", temp_path],
-            ):
-                with pytest.raises(SystemExit) as exc_info:
-                    main()
-                # File skipped because it doesn't match the include pattern
-                assert exc_info.value.code == 0
-        finally:
-            os.unlink(temp_path)
-
-    def test_include_skips_non_matching_file_verbose(self, capsys):
+        assert cli.run(["--include", "Jenkinsfile*", utils_groovy_file]) == 0
+
+    def test_include_skips_non_matching_file_verbose(self, capsys, utils_groovy_file):
         """Test that skipped non-matching files are reported in verbose mode."""
-        f = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".groovy")
-        f.write("class Utils { }")
-        f.flush()
-        f.close()
-        temp_path = f.name
-
-        try:
-            with patch(
-                "sys.argv",
-                [
-                    "jenkinsfilelint",
-                    "--verbose",
-                    "--include",
-                    "Jenkinsfile*",
-                    temp_path,
-                ],
-            ):
-                with pytest.raises(SystemExit) as exc_info:
-                    main()
-                assert exc_info.value.code == 0
-
-            captured = capsys.readouterr()
-            assert "does not match include pattern" in captured.out
-        finally:
-            os.unlink(temp_path)
-
-    def test_include_and_skip_combined(self, capsys):
+        exit_code = cli.run(
+            [
+                "--verbose",
+                "--include",
+                "Jenkinsfile*",
+                utils_groovy_file,
+            ]
+        )
+        assert exit_code == 0
+
+        captured = capsys.readouterr()
+        assert "does not match include pattern" in captured.out
+
+    def test_include_and_skip_combined(self, mock_validate, sample_files):
         """Test combining --include and --skip options.
 
         --include whitelists files, --skip then blacklists within that set.
         """
-        groovy_dir = tempfile.mkdtemp()
-        pipeline_file = os.path.join(groovy_dir, "deploy.groovy")
-        helper_file = os.path.join(groovy_dir, "utils.groovy")
-
-        with open(pipeline_file, "w") as f:
-            f.write("pipeline { agent any }")
-        with open(helper_file, "w") as f:
-            f.write("def call() { }")
-
-        try:
-            with patch(
-                "sys.argv",
-                [
-                    "jenkinsfilelint",
-                    "--jenkins-url",
-                    "https://jenkins.example.com",
-                    "--include",
-                    "*.groovy",
-                    "--skip",
-                    "*/utils.groovy",
-                    pipeline_file,
-                    helper_file,
-                ],
-            ):
-                with patch("jenkinsfilelint.linter.requests.post") as mock_post:
-                    mock_response = Mock()
-                    mock_response.status_code = 200
-                    mock_response.json.return_value = {"status": "ok"}
-                    mock_response.raise_for_status = Mock()
-                    mock_post.return_value = mock_response
-
-                    with pytest.raises(SystemExit) as exc_info:
-                        main()
-                    assert exc_info.value.code == 0
-                    # Only deploy.groovy validated; utils.groovy is skipped
-                    mock_post.assert_called_once()
-        finally:
-            os.unlink(pipeline_file)
-            os.unlink(helper_file)
-            os.rmdir(groovy_dir)
-
-    def test_multiple_include_patterns(self, capsys):
+        exit_code = cli.run(
+            [
+                "--jenkins-url",
+                "https://jenkins.example.com",
+                "--include",
+                "*.groovy",
+                "--skip",
+                "*/utils.groovy",
+                sample_files.deploy_groovy,
+                sample_files.helper_groovy,
+            ]
+        )
+        assert exit_code == 0
+        # Only deploy.groovy validated; utils.groovy is skipped
+        mock_validate.assert_called_once()
+        assert mock_validate.call_args[0][1] == sample_files.deploy_groovy
+
+    def test_multiple_include_patterns(self, mock_validate, sample_files):
         """Test using multiple --include options."""
-        jenkinsfile = tempfile.NamedTemporaryFile(
-            mode="w", delete=False, prefix="Jenkinsfile"
+        exit_code = cli.run(
+            [
+                "--jenkins-url",
+                "https://jenkins.example.com",
+                "--include",
+                "Jenkinsfile*",
+                "--include",
+                "*/pipeline.groovy",
+                sample_files.jenkinsfile,
+                sample_files.pipeline_groovy,
+                sample_files.helper_groovy,
+            ]
         )
-        jenkinsfile.write("pipeline { agent any }")
-        jenkinsfile.flush()
-        jenkinsfile.close()
-        jenkinsfile_path = jenkinsfile.name
-
-        groovy_dir = tempfile.mkdtemp()
-        pipeline_groovy = os.path.join(groovy_dir, "pipeline.groovy")
-        helper_groovy = os.path.join(groovy_dir, "utils.groovy")
-
-        with open(pipeline_groovy, "w") as f:
-            f.write("pipeline { agent any }")
-        with open(helper_groovy, "w") as f:
-            f.write("def call() { }")
-
-        try:
-            with patch(
-                "sys.argv",
-                [
-                    "jenkinsfilelint",
-                    "--jenkins-url",
-                    "https://jenkins.example.com",
-                    "--include",
-                    "Jenkinsfile*",
-                    "--include",
-                    "*/pipeline.groovy",
-                    jenkinsfile_path,
-                    pipeline_groovy,
-                    helper_groovy,
-                ],
-            ):
-                with patch("jenkinsfilelint.linter.requests.post") as mock_post:
-                    mock_response = Mock()
-                    mock_response.status_code = 200
-                    mock_response.json.return_value = {"status": "ok"}
-                    mock_response.raise_for_status = Mock()
-                    mock_post.return_value = mock_response
-
-                    with pytest.raises(SystemExit) as exc_info:
-                        main()
-                    assert exc_info.value.code == 0
-                    # Jenkinsfile and pipeline.groovy validated; utils.groovy skipped
-                    assert mock_post.call_count == 2
-        finally:
-            os.unlink(jenkinsfile_path)
-            os.unlink(pipeline_groovy)
-            os.unlink(helper_groovy)
-            os.rmdir(groovy_dir)
+        assert exit_code == 0
+        # Jenkinsfile and pipeline.groovy validated; utils.groovy skipped
+        assert mock_validate.call_count == 2
 
 
 class TestWindowsUTF8Encoding:
     """Test UTF-8 encoding setup on Windows."""
 
+    @pytest.fixture(autouse=True)
+    def reset_streams_wrapped(self, monkeypatch):
+        """Let each test start with the streams not yet wrapped."""
+        monkeypatch.setattr(cli, "_STREAMS_WRAPPED", False)
+
     def test_windows_utf8_stdout_and_stderr_wrapped(self):
         """Test that stdout/stderr are wrapped with UTF-8 on win32 when needed."""
-        import io
-
         mock_stdout = Mock()
         mock_stdout.buffer = io.BytesIO()
         mock_stderr = Mock()
@@ -680,14 +479,11 @@ class TestWindowsUTF8Encoding:
         with patch("sys.platform", "win32"):
             with patch("sys.stdout", mock_stdout):
                 with patch("sys.stderr", mock_stderr):
-                    with patch("sys.argv", ["jenkinsfilelint", "--help"]):
-                        with pytest.raises(SystemExit):
-                            main()
+                    with pytest.raises(SystemExit):
+                        main(["--help"])
 
     def test_windows_utf8_already_wrapped_utf8(self):
         """Test that stdout/stderr are not re-wrapped when already UTF-8 TextIOWrapper."""
-        import io
-
         mock_stdout = Mock(spec=io.TextIOWrapper)
         mock_stdout.encoding = "utf-8"
         mock_stderr = Mock(spec=io.TextIOWrapper)
@@ -696,6 +492,22 @@ class TestWindowsUTF8Encoding:
         with patch("sys.platform", "win32"):
             with patch("sys.stdout", mock_stdout):
                 with patch("sys.stderr", mock_stderr):
-                    with patch("sys.argv", ["jenkinsfilelint", "--help"]):
-                        with pytest.raises(SystemExit):
-                            main()
+                    with pytest.raises(SystemExit):
+                        main(["--help"])
+
+    def test_windows_utf8_streams_wrapped_once(self):
+        """Test that stdout/stderr are only checked on the first invocation."""
+        mock_stdout = Mock()
+        mock_stdout.buffer = io.BytesIO()
+        mock_stderr = Mock()
+        mock_stderr.buffer = io.BytesIO()
+
+        with patch("sys.platform", "win32"):
+            with patch("sys.stdout", mock_stdout):
+                with patch("sys.stderr", mock_stderr):
+                    cli._ensure_utf8_streams()
+                    assert isinstance(sys.stdout, io.TextIOWrapper)
+
+                    sys.stdout = mock_stdout
+                    cli._ensure_utf8_streams()
+                    assert sys.stdout is mock_stdout